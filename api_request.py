@@ -11,6 +11,8 @@
 ║ - Pulls the latest cryptocurrency listings using CoinMarketCap's API.            ║
 ║ - Handles network issues such as connection errors, timeouts, and redirects.     ║
 ║ - Saves data to a JSON file with a timestamp of the last pull.                   ║
+║ - Enriches the listing with coin logos and descriptions (see metadata.py) on a   ║
+║   background thread, in parallel with the listing request.                       ║
 ║ - Provides status messages based on success or failure of the API request.       ║
 ║                                                                                  ║
 ║ Error Codes:                                                                     ║
@@ -22,12 +24,27 @@
 """
 
 
+import os
 import json
+import threading
 from requests import Session
 from datetime import datetime
 from time_stamp import save_timestamp
+from metadata import MetadataCache, enrich
+from concurrent.futures import ThreadPoolExecutor, Future
 from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
 
+
+API_HEADERS = {
+    'Accepts': 'application/json',
+    # API Key (Look at README.md to see how you can get your own for free!)
+    'X-CMC_PRO_API_KEY': 'your-api-key',
+}
+
+# Runs the metadata enrichment off the UI thread, one pull at a time
+enrichment_executor = ThreadPoolExecutor(max_workers=1)
+
+
 def api_runner(file_path: str, active_message: list[str]):
     """
     Function to pull cryptocurrency data from CoinMarketCap API and handle errors.
@@ -42,14 +59,8 @@ def api_runner(file_path: str, active_message: list[str]):
         'limit': '50',    # Limit to top 50 cryptocurrencies (NOTE YOU CAN CHANGE THIS VALUE BUT BE AWARE OF PULL CREDITS)
         'convert': 'USD'  # Convert prices to USD (NOTE YOU CAN CHANGE THE CURRENCY)
     }
-    headers = {
-        'Accepts': 'application/json',
-        # API Key (Look at README.md to see how you can get your own for free!)
-        'X-CMC_PRO_API_KEY': 'your-api-key',
-    }
-    
     session = Session() 
-    session.headers.update(headers)
+    session.headers.update(API_HEADERS)
     
     try:
         # Make the API request
@@ -96,12 +107,73 @@ def api_runner(file_path: str, active_message: list[str]):
         active_message[1] = f"An error occurred: {str(e)}"
 
 
-def pull_from_api(file_path: str, active_message: list[str]) -> None:
+def read_saved_ids(file_path: str) -> list[int]:
+    """
+    Returns the coin ids of the last saved pull, or an empty list if there is none.
+    """
+    try:
+        if os.path.exists(file_path):
+            with open(file_path, "r") as file:
+                return [crypto["id"] for crypto in json.load(file).get("data", [])]
+    except Exception as e:
+        print(f"Error reading saved ids: {e}")
+    return []
+
+
+def enrich_listing(file_path: str, saved_ids: list[int], active_message: list[str], 
+                   listing_done: threading.Event, metadata_cache: MetadataCache) -> int:
+    """
+    Fetches the metadata of the coins of the last saved pull while the listing is 
+    being pulled, then the metadata of the coins that are new in the listing.
+
+    Runs on the enrichment thread. Ids of the first pass are not requested again 
+    by the second one (failed ids are also backed off by the cache).
+
+    Returns:
+    int: The number of coins whose metadata was fetched.
+    """
+    fetched = enrich(saved_ids, metadata_cache, API_HEADERS)
+
+    # Wait for the listing request running on the UI thread
+    listing_done.wait()
+    if active_message[0] == 0:
+        known_ids = set(saved_ids)
+        listing_ids = read_saved_ids(file_path)
+        new_ids = [crypto_id for crypto_id in listing_ids if crypto_id not in known_ids]
+        fetched += enrich(new_ids, metadata_cache, API_HEADERS, listed_ids=listing_ids)
+
+    return fetched
+
+
+def pull_from_api(file_path: str, active_message: list[str], metadata_cache: MetadataCache = None) -> Future:
     """
     Pulls cryptocurrency data from the API and updates the local JSON file.
 
     This function interacts with the `api_runner` to pull the latest crypto data 
     and save it to the specified JSON file, either creating or overwriting the file. 
     If an error occurs during the pull, the status is reflected in `active_message`.
+
+    If a metadata cache is given, the coin metadata is fetched on a background 
+    thread (see `enrich_listing`) while the listing is pulled. Coins already in the 
+    cache cost no requests.
+
+    Returns:
+    Future: The background enrichment (its result is the number of coins fetched), 
+    or None without a metadata cache.
     """
-    api_runner(file_path, active_message)
\ No newline at end of file
+    if metadata_cache is None:
+        api_runner(file_path, active_message)
+        return None
+
+    # Start the enrichment of the known coins, then pull the listing at the same time
+    saved_ids = read_saved_ids(file_path)
+    listing_done = threading.Event()
+    future = enrichment_executor.submit(
+        enrich_listing, file_path, saved_ids, active_message, listing_done, metadata_cache
+    )
+    try:
+        api_runner(file_path, active_message)
+    finally:
+        listing_done.set()
+
+    return future
@@ -11,6 +11,9 @@
 ║ Key features:                                                                    ║
 ║ - Format price, percentage change, market cap, and total supply for display.     ║
 ║ - Process cryptocurrency data and format it into a table-friendly format.        ║
+║ - Index processed rows by coin id for constant-time lookup of the selected coin. ║
+║ - Process portfolio positions into a table-friendly format.                      ║
+║ - Shorten coin descriptions for the detail panel.                                ║
 ║ - Clear tkinter frames by removing all widgets.                                  ║
 ╚══════════════════════════════════════════════════════════════════════════════════╝
 """
@@ -70,6 +73,37 @@ def format_total_supply(total_supply: float, short_name: str) -> str:
     return f"{total_supply: .8g} {short_name}"
 
 
+def format_pnl(pnl: float) -> str:
+    """
+    Formats a profit/loss value with its sign for display.
+
+    Parameters:
+    pnl (float): The profit (positive) or loss (negative) in USD.
+
+    Returns:
+    str: The formatted profit/loss string.
+    """
+    sign = "+" if pnl >= 0 else "-"
+    return f"{sign}${abs(pnl):,.2f}"
+
+
+def format_description(description: str, max_length: int = 240) -> str:
+    """
+    Shortens a coin description for display, cutting it at a word boundary.
+
+    Parameters:
+    description (str): The coin description.
+    max_length (int): The maximum number of characters to keep.
+
+    Returns:
+    str: The shortened description.
+    """
+    description = " ".join(description.split())  # Collapse newlines and repeated spaces
+    if len(description) <= max_length:
+        return description
+    return description[:max_length].rsplit(" ", 1)[0] + "..."
+
+
 def clear_frame(frame):
     """
     Clears all widgets from the specified frame.
@@ -101,6 +135,7 @@ def process_crypto_data(data: list, table_data: list) -> list:
         crypto_market_cap = format_market_cap(crypto["quote"]["USD"]["market_cap"])
         short_name = crypto["symbol"]
         total_supply = format_total_supply(crypto["total_supply"], short_name)
+        crypto_id = crypto["id"]
 
         # Create a row with the formatted data
         temp = [
@@ -111,9 +146,81 @@ def process_crypto_data(data: list, table_data: list) -> list:
             day_change,
             crypto_market_cap,
             short_name,
-            total_supply
+            total_supply,
+            crypto_id   # Kept last so the row can be found again after sorting/filtering
         ]
         table_data.append(temp)
         number += 1  # Increment row number
 
-    return table_data
\ No newline at end of file
+    return table_data
+
+
+def index_crypto_rows(table_data: list) -> dict:
+    """
+    Builds a lookup map from coin id to its processed table row.
+
+    table_data (list): The processed table data, including the header row.
+
+    Returns:
+    dict: A dictionary mapping each coin id to its row of formatted data.
+    """
+    # Skip the header row, the coin id is always the last value of a data row
+    return {row[-1]: row for row in table_data[1:]}
+
+
+def format_portfolio_row(portfolio, row: int) -> list:
+    """
+    Formats a single portfolio position for display in the portfolio table.
+
+    portfolio (Portfolio): The portfolio holding the position columns.
+    row (int): The row of the position in the portfolio columns.
+
+    Returns:
+    list: The formatted coin, quantity, price, value, P&L and allocation ("n/a" 
+    for the price columns of a position without a price).
+    """
+    name = portfolio.symbols[row] or f"id {portfolio.ids[row]}"
+    quantity = f"{portfolio.quantity[row]:.8g}"
+
+    # Not in any pull yet, so there is no value to show (rather than a loss)
+    if portfolio.price[row] is None:
+        return [name, quantity, "n/a", "n/a", "n/a", "n/a"]
+
+    return [
+        name,
+        quantity,
+        format_price(portfolio.price[row]),
+        format_price(portfolio.value[row]),
+        format_pnl(portfolio.pnl[row]),
+        format_allocation(portfolio.allocation[row])
+    ]
+
+
+def format_allocation(allocation: float) -> str:
+    """
+    Formats the allocation (percent of the portfolio value) for display.
+    """
+    return f"{allocation:.2f}%"
+
+
+def portfolio_display_order(portfolio) -> list[int]:
+    """
+    Returns the portfolio rows in the order they are shown, largest value first.
+    """
+    return sorted(range(len(portfolio.ids)), key=lambda row: portfolio.value[row], reverse=True)
+
+
+def process_portfolio_data(portfolio, table_data: list) -> list:
+    """
+    Formats the portfolio positions for display in the portfolio table.
+
+    portfolio (Portfolio): The portfolio holding the position columns.
+    table_data (list): The table data to append to.
+
+    Returns:
+    list: The updated table data with one row per position, largest value first.
+    """
+    for row in portfolio_display_order(portfolio):
+        table_data.append(format_portfolio_row(portfolio, row))
+
+    return table_data
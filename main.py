@@ -10,12 +10,19 @@
 ║ - A table that lists cryptocurrencies with their name, price, percent changes,   ║
 ║   and market capitalization.                                                     ║
 ║ - An interactive UI that allows users to view more details about any listed coin.║
+║ - A portfolio view (Account button) with the value, P&L and allocation of the    ║
+║   user's own holdings.                                                           ║
+║ - A replay mode (--replay DIR or --synthetic N) to load test the UI without the  ║
+║   API, see replay.py.                                                            ║
+║ - Coin logos in the table and a description of the selected coin, from the       ║
+║   cached metadata (see metadata.py).                                             ║
 ╚══════════════════════════════════════════════════════════════════════════════════╝
 """
 
 
 import os                                    # imports os
 import json                                  # imports json
+import argparse                              # imports argparse to read the replay mode options
 from PIL import Image                        # imports PIL (image) to be able to open images
 from formating import *                      # imports the formating functions
 from customtkinter import *                  # imports customtkinter to display data more visually
@@ -23,12 +30,31 @@ from CTkTable import CTkTable                # imports CTKTable to display table
 from functools import partial                # imports functools (partial)
 from time_stamp import read_timestamp        # imports the read_timestamp function to read a last pulled time
 from api_request import pull_from_api        # imports the pull_from_api
+from metadata import MetadataCache, THUMBNAIL_SIZE  # imports the cache of coin logos and descriptions
+from portfolio import *                      # imports the portfolio holdings and valuation
+from replay import *                         # imports the replay mode used for load testing
 from datetime import datetime, timedelta     # imports datetime to save the time last pulled from api (due to limits of pulls)
 
 
 # Global variables
 global name_and_price_metric, total_spuply_metric, _24_hour_change_metric, metrics_frame
 global table_frame, table
+global portfolio, portfolio_table_frame, portfolio_table
+
+crypto_index = {}           # Maps a coin id to its processed row, rebuilt on every data update
+displayed_ids = []          # Coin id of every row the table widget shows (None for the header)
+detail_vars = {}            # Bound variables of the coin detail labels, keyed by field name
+detail_labels = {}          # The coin detail labels (created once), keyed by field name
+placeholder_labels = []     # "Click on a coin" labels shown until the first selection
+latest_data = []            # The raw coin entries of the last data update
+views = {}                  # The frames that can be shown next to the sidebar, keyed by name
+portfolio_vars = {}         # Bound variables of the portfolio summary
+portfolio_widgets = {}      # The portfolio P&L label and position form entries, keyed by name
+portfolio_table_rows = {}   # Maps the coin id of a position to its row in the portfolio table
+portfolio = Portfolio([])   # The user's holdings, loaded from the holdings file in main
+metadata_cache = None       # Coin logos and descriptions, created in main
+logo_images = {}            # Decoded logo thumbnails keyed by coin id, so each is only loaded once
+replay_runner = None        # The running replay (replay mode only)
 
 
 def update_data(file_path: str) -> None:
@@ -49,6 +75,16 @@ def update_data(file_path: str) -> None:
             # Process the data if the 'data' key is found in the JSON file
             if "data" in info_dict.keys():
                 table_data = process_crypto_data(info_dict["data"], table_data)
+                latest_data[:] = info_dict["data"]
+
+    # Rebuild the id lookup used when a row is clicked
+    crypto_index.clear()
+    crypto_index.update(index_crypto_rows(table_data))
+
+    # Revalue the portfolio positions, only the rows whose price changed are redrawn
+    changed_rows = portfolio.update_prices(latest_data)
+    if changed_rows:
+        update_portfolio_ui(changed_rows)
 
     # Update the UI with the new data
     update_table_ui(table_data)
@@ -67,11 +103,14 @@ def update_table_ui(table_data: list) -> None:
     # Destroy the old table UI element
     table.destroy()
 
+    # Remember which coin each displayed row holds, rebuilt with the table values
+    displayed_ids[:] = [None] + [row[-1] for row in table_data[1:]]
+
     # Create a new table with the updated data
     table = CTkTable(
         master=table_frame,
         border_width=7,
-        command=lambda row: print_row(row, table_data),
+        command=print_row,
         border_color="#2c2c91",
         values=table_data,
         colors=["#484ab8", "#5a5de6"],
@@ -92,74 +131,144 @@ def update_table_ui(table_data: list) -> None:
             hover_color="#d37fcc"
         )
 
+    # Show the coin logos next to their names
+    refresh_table_logos()
+
     # Pack the table into the window
     table.pack(expand=True)
 
 
-def print_row(row: dict, table_data: list) -> None:
+def refresh_table_logos() -> None:
+    """
+    Shows the cached logo next to the name of every coin in the table.
+    """
+    for row_index, crypto_id in enumerate(displayed_ids):
+        if crypto_id is None:
+            continue
+        logo = get_logo_image(crypto_id)
+        if logo is not None:
+            table.edit(row_index, 1, image=logo, compound="left")
+
+
+def watch_enrichment(future) -> None:
+    """
+    Checks the background metadata enrichment from the tkinter loop and shows 
+    the new logos once it is done.
+
+    future (Future): The enrichment returned by `pull_from_api` (may be None).
+    """
+    if future is None:
+        return
+
+    # Not done yet, check again later without blocking the UI
+    if not future.done():
+        table_frame.after(200, watch_enrichment, future)
+        return
+
+    try:
+        fetched = future.result()
+        print(f"Metadata fetched for {fetched} new coins")
+    except Exception as e:
+        print(f"Metadata enrichment failed: {e}")
+        return
+
+    refresh_table_logos()
+
+
+def get_logo_image(crypto_id: int) -> CTkImage:
+    """
+    Returns the logo thumbnail of a coin as a CTkImage, or None if the logo is not 
+    cached. Thumbnails are already resized on disk and only decoded the first time.
+
+    crypto_id (int): The coin id.
+    """
+    if crypto_id in logo_images:
+        return logo_images[crypto_id]
+
+    thumbnail_path = metadata_cache.thumbnail_path(crypto_id) if metadata_cache else None
+    if thumbnail_path is None:
+        return None
+
+    try:
+        thumbnail = Image.open(thumbnail_path)
+        logo_images[crypto_id] = CTkImage(dark_image=thumbnail, light_image=thumbnail, size=THUMBNAIL_SIZE)
+    except Exception as e:
+        print(f"Error loading logo: {e}")
+        return None
+
+    return logo_images[crypto_id]
+
+
+def print_row(row: dict) -> None:
     """
     Retrieves the data of the selected row from the table and updates the 
     displayed cryptocurrency information at the top boxes of tkinter window.
 
     row (dict): A dictionary containing the selected row's information, with 
-    the key "row" representing the row number.
-    
-    table_data (list): A list of all row data, where each row is a list of 
-    cryptocurrency information.
+    the key "row" representing the row number as displayed by the table widget.
     """
     # Get the row number from the 'row' dictionary, ensuring it's at least 1
     row_num = row["row"]
     row_num = max(1, row_num)  # Ensure row number is not less than 1
 
-    # Retrieve the data for the specified row from the table_data
-    row_data = table_data[row_num]
+    # Nothing to show if the table only holds the header
+    if row_num >= len(displayed_ids):
+        return
+
+    # Find the coin shown in that row by its id, then look its data up by id so 
+    # the selection stays right when the displayed rows are sorted or filtered
+    crypto_id = displayed_ids[row_num]
+    row_data = crypto_index.get(crypto_id)
 
     # Update the displayed information using the row data
-    update_crypto_info(row_data)
+    if row_data is not None:
+        update_crypto_info(row_data)
     
 
-def update_crypto_info(row_data: list[str]) -> None:
+def update_crypto_info(row_data: list) -> None:
     """
     Updates the displayed cryptocurrency information based on the selected row 
     data at the top boxes of the tkinter screen.
 
+    The labels are created once in `create_metrics_view`, so this only sets their 
+    bound variables (and the change colors) instead of rebuilding widgets.
+
     row_data (list): A list containing cryptocurrency data such as rank, name, price, 
-    hourly and daily changes, market cap, short name, and total supply.
+    hourly and daily changes, market cap, short name, total supply and coin id.
     """
-    # Clear old content from the metric frames
-    clear_frame(name_and_price_metric)
-    clear_frame(total_spuply_metric)
-    clear_frame(_24_hour_change_metric)
+    # Swap the placeholder text for the detail labels on the first selection
+    if placeholder_labels:
+        for label in placeholder_labels:
+            label.grid_forget()
+        placeholder_labels.clear()
+        show_detail_labels()
 
     # Unpack the row data
-    rank, name, price, hour_change, day_change, market_cap, short_name, total_supply = row_data
-
-    # Update the 'name_and_price_metric' frame with cryptocurrency name, symbol, and price
-    CTkLabel(master=name_and_price_metric, text=f"{name}", text_color="#fff", font=("Arial Bold", 17))\
-        .grid(row=0, column=0, rowspan=2, padx=(5, 10), pady=10)
-    CTkLabel(master=name_and_price_metric, text=f"{short_name}", text_color="gray", font=("Arial Bold", 12))\
-        .grid(row=0, column=1, pady=2, sticky="sw")
-    CTkLabel(master=name_and_price_metric, text=f"{price}", text_color="pink", font=("Arial Bold", 19), justify="left")\
-        .grid(row=2, column=0, padx=(5, 5), sticky="nw", pady=(0, 10))
-
-    # Update the 'total_spuply_metric' frame with the total supply of the cryptocurrency
-    CTkLabel(master=total_spuply_metric, text="Total Supply:", text_color="#fff", font=("Arial Bold", 17))\
-        .grid(row=0, column=0, rowspan=2, padx=(5, 200), pady=10)
-    CTkLabel(master=total_spuply_metric, text=f"{total_supply}", text_color="pink", font=("Arial Bold", 16), justify="left")\
-        .grid(row=2, column=0, padx=(5, 5), sticky="nw", pady=(0, 10))
-
-    # Update the '_24_hour_change_metric' frame with the 24-hour percentage change title
-    CTkLabel(master=_24_hour_change_metric, text="24H % Change", text_color="#fff", font=("Arial Bold", 17))\
-        .grid(row=0, column=0, rowspan=2, padx=(5, 200), pady=10)
+    rank, name, price, hour_change, day_change, market_cap, short_name, total_supply, crypto_id = row_data
+
+    # Update the bound variables, the labels redraw themselves
+    detail_vars["name"].set(name)
+    detail_vars["short_name"].set(short_name)
+    detail_vars["price"].set(price)
+    detail_vars["total_supply"].set(total_supply)
+    detail_vars["market_cap"].set(f"MKT. Cap: {market_cap}")
+    detail_vars["day_change"].set(day_change)
+    detail_vars["hour_change"].set(f"1h: {hour_change}")
+    detail_vars["description"].set(
+        format_description(metadata_cache.description(crypto_id) if metadata_cache else "")
+    )
 
     # Determine color based on whether the change is positive (green) or negative (red)
-    color = "#01ff85" if day_change[0] == "▲" else "#ff7a7a"
-    
-    # Display the 24-hour change with the appropriate color
-    CTkLabel(master=_24_hour_change_metric, text=f"{day_change}", text_color=color, font=("Arial Bold", 16), justify="left")\
-        .grid(row=2, column=0, padx=(5, 5), sticky="nw", pady=(0, 10))
+    detail_labels["day_change"].configure(text_color=change_color(day_change))
+    detail_labels["hour_change"].configure(text_color=change_color(hour_change))
 
-    # Further updates (e.g., for hour_change and market_cap) can be added here if needed.
+
+def change_color(change: str) -> str:
+    """
+    Returns the text color for a formatted percentage change, green when it went 
+    up and red when it went down.
+    """
+    return "#01ff85" if change[0] == "▲" else "#ff7a7a"
 
 
 def check_last_pulled_and_pull(file_path: str, active_message: list[str]) -> None:
@@ -176,7 +285,7 @@ def check_last_pulled_and_pull(file_path: str, active_message: list[str]) -> Non
 
     # If no last pull time exists, pull new data and then update_data gets called in main
     if last_pull_time == None:
-        pull_from_api(file_path, active_message)        # Pull data from the API
+        watch_enrichment(pull_from_api(file_path, active_message, metadata_cache))  # Pull data from the API
         print(active_message)                           # Output the result message
         return
     
@@ -186,7 +295,7 @@ def check_last_pulled_and_pull(file_path: str, active_message: list[str]) -> Non
     # Check if enough time has passed since the last pull (2 hours NOTE you can change but be 
     # careful if you are a free user of the coinMarketCap API)
     if (time_now - last_pull_time) >= timedelta(hours=2):
-        pull_from_api(file_path, active_message)     # Pull new data from the API
+        watch_enrichment(pull_from_api(file_path, active_message, metadata_cache))  # Pull new data from the API
         
         # If pull is successful, update the data
         if active_message[0] == 0:
@@ -229,7 +338,7 @@ def create_sidebar(app: CTk) -> None:
     # Create a button for the Dashboard with the icon and styling
     CTkButton(master=sidebar_frame,image=package_img, text="Dashboard", corner_radius=10, 
         fg_color="#5a5de6", font=("Arial Bold", 15), text_color="#fff", 
-        hover_color="#d37fcc", anchor="w"
+        hover_color="#d37fcc", anchor="w", command=partial(show_view, "dashboard")
     ).pack(anchor="center", ipady=5, pady=(60, 0))
 
     # Load the settings icon from assets
@@ -244,10 +353,10 @@ def create_sidebar(app: CTk) -> None:
     # Load the person_icon from assets
     person_img_data = Image.open(os.path.join("assets", "person_icon.png"))
     person_img = CTkImage(dark_image=person_img_data, light_image=person_img_data)
-    # Create a button with Acount icon and transparent background
+    # Create a button with Acount icon and transparent background, it opens the portfolio view
     CTkButton(master=sidebar_frame, image=person_img, text="Account", corner_radius=10, 
         fg_color="transparent", font=("Arial Bold", 15), hover_color="#d37fcc", 
-        anchor="w"
+        anchor="w", command=partial(show_view, "portfolio")
     ).pack(anchor="center", ipady=5, pady=(16, 0))
 
 
@@ -267,6 +376,7 @@ def create_main_view(app: CTk) -> CTkFrame:
     main_view.pack_propagate(0)
     # Pack the main view to the left side of the window
     main_view.pack(side="left")
+    views["dashboard"] = main_view
 
     # Create the title frame inside the main view
     title_frame = CTkFrame(master=main_view, fg_color="transparent")
@@ -293,7 +403,10 @@ def create_main_view(app: CTk) -> CTkFrame:
 def create_metrics_view(main_view: CTkFrame) -> None:
     """
     Creates the metrics view section, consisting of three frames for displaying
-    metrics: name and price, total supply, and 24-hour change.
+    metrics: name and price, total supply and market cap, and 24-hour and 1-hour change.
+
+    The detail labels are created here once and bound to string variables, they 
+    are only placed on the grid after the first coin is selected.
     
     main_view (CTkFrame): The main view frame where the metrics view will be placed.
     """
@@ -304,6 +417,12 @@ def create_metrics_view(main_view: CTkFrame) -> None:
     metrics_frame = CTkFrame(master=main_view, fg_color="transparent")
     metrics_frame.pack(anchor="n", fill="x",  padx=27, pady=(36, 0))
 
+    # Description of the selected coin, under the metric frames
+    detail_vars["description"] = StringVar(value="")
+    detail_labels["description"] = CTkLabel(master=main_view, textvariable=detail_vars["description"], 
+        text_color="#fff", font=("Arial", 11), justify="left", anchor="w", wraplength=620)
+    detail_labels["description"].pack(anchor="n", fill="x", padx=27, pady=(8, 0))
+
     # Name and Price Metric Frame
     name_and_price_metric = CTkFrame(master=metrics_frame, corner_radius=10, border_width=0, 
         fg_color="#2c2c91", border_color="#7a7ded", 
@@ -312,9 +431,10 @@ def create_metrics_view(main_view: CTkFrame) -> None:
     name_and_price_metric.grid_propagate(0)
     name_and_price_metric.pack(side="left")
     # Label for Name and Price metric
-    CTkLabel(master=name_and_price_metric, text="Click on a coin to start", text_color="pink", 
-        font=("Arial Bold", 13), justify="center"
-    ).grid(padx= (20, 25), pady=25, sticky="sw")
+    placeholder = CTkLabel(master=name_and_price_metric, text="Click on a coin to start", text_color="pink", 
+        font=("Arial Bold", 13), justify="center")
+    placeholder.grid(padx= (20, 25), pady=25, sticky="sw")
+    placeholder_labels.append(placeholder)
     
     # Total Supply Metric Frame
     total_spuply_metric = CTkFrame(master=metrics_frame, corner_radius=10, border_width=0, 
@@ -324,9 +444,10 @@ def create_metrics_view(main_view: CTkFrame) -> None:
     total_spuply_metric.grid_propagate(0)
     total_spuply_metric.pack(side="left", expand=True, anchor="center")
     # Label for Total Supply metric
-    CTkLabel(master=total_spuply_metric, text="______________________", text_color="pink", 
-        font=("Arial Bold", 13), justify="center").grid(padx= (20, 25), 
-    pady=25, sticky="sw")
+    placeholder = CTkLabel(master=total_spuply_metric, text="______________________", text_color="pink", 
+        font=("Arial Bold", 13), justify="center")
+    placeholder.grid(padx= (20, 25), pady=25, sticky="sw")
+    placeholder_labels.append(placeholder)
 
     # 24-Hour Change Metric Frame
     _24_hour_change_metric = CTkFrame(master=metrics_frame, corner_radius=10, border_width=0, 
@@ -336,9 +457,282 @@ def create_metrics_view(main_view: CTkFrame) -> None:
     _24_hour_change_metric.grid_propagate(0)
     _24_hour_change_metric.pack(side="right")
     # Label for 24-Hour Change metric
-    CTkLabel(master=_24_hour_change_metric, text="______________________", text_color="pink", 
-        font=("Arial Bold", 13), justify="center"
-    ).grid(padx= (20, 25), pady=25, sticky="sw")
+    placeholder = CTkLabel(master=_24_hour_change_metric, text="______________________", text_color="pink", 
+        font=("Arial Bold", 13), justify="center")
+    placeholder.grid(padx= (20, 25), pady=25, sticky="sw")
+    placeholder_labels.append(placeholder)
+
+    create_detail_labels()
+
+
+def create_detail_labels() -> None:
+    """
+    Creates the coin detail labels of the three metric frames once, each bound to 
+    a StringVar in `detail_vars` so a row click only has to set new values. The 
+    labels get a fixed height so three rows fit in the 80px high frames.
+    """
+    # Bound variables for every value that changes with the selected coin
+    for field in ("name", "short_name", "price", "total_supply", "market_cap", "day_change", "hour_change"):
+        detail_vars[field] = StringVar(value="")
+
+    # Labels of the 'name_and_price_metric' frame (name, symbol and price)
+    detail_labels["name"] = CTkLabel(master=name_and_price_metric, textvariable=detail_vars["name"], 
+        text_color="#fff", font=("Arial Bold", 17), height=24)
+    detail_labels["short_name"] = CTkLabel(master=name_and_price_metric, textvariable=detail_vars["short_name"], 
+        text_color="gray", font=("Arial Bold", 12), height=16)
+    detail_labels["price"] = CTkLabel(master=name_and_price_metric, textvariable=detail_vars["price"], 
+        text_color="pink", font=("Arial Bold", 19), height=26, justify="left")
+
+    # Labels of the 'total_spuply_metric' frame (total supply and market cap)
+    detail_labels["total_supply_title"] = CTkLabel(master=total_spuply_metric, text="Total Supply:", 
+        text_color="#fff", font=("Arial Bold", 17), height=24)
+    detail_labels["total_supply"] = CTkLabel(master=total_spuply_metric, textvariable=detail_vars["total_supply"], 
+        text_color="pink", font=("Arial Bold", 16), height=24, justify="left")
+    detail_labels["market_cap"] = CTkLabel(master=total_spuply_metric, textvariable=detail_vars["market_cap"], 
+        text_color="gray", font=("Arial Bold", 12), height=16, justify="left")
+
+    # Labels of the '_24_hour_change_metric' frame (24-hour and 1-hour change)
+    detail_labels["day_change_title"] = CTkLabel(master=_24_hour_change_metric, text="24H % Change", 
+        text_color="#fff", font=("Arial Bold", 17), height=24)
+    detail_labels["day_change"] = CTkLabel(master=_24_hour_change_metric, textvariable=detail_vars["day_change"], 
+        text_color="#fff", font=("Arial Bold", 16), height=24, justify="left")
+    detail_labels["hour_change"] = CTkLabel(master=_24_hour_change_metric, textvariable=detail_vars["hour_change"], 
+        text_color="#fff", font=("Arial Bold", 12), height=16, justify="left")
+
+
+def show_detail_labels() -> None:
+    """
+    Places the coin detail labels on the grid of their metric frames (the rows 
+    and padding add up to less than the 80px frame height, as the frames do not 
+    grow with their contents).
+    """
+    # Name, symbol and price
+    detail_labels["name"].grid(row=0, column=0, rowspan=2, padx=(5, 10), pady=(6, 2))
+    detail_labels["short_name"].grid(row=0, column=1, pady=(6, 0), sticky="sw")
+    detail_labels["price"].grid(row=2, column=0, padx=(5, 5), sticky="nw", pady=(0, 6))
+
+    # Total supply with the market cap underneath
+    detail_labels["total_supply_title"].grid(row=0, column=0, padx=(5, 5), pady=(4, 0), sticky="w")
+    detail_labels["total_supply"].grid(row=1, column=0, padx=(5, 5), sticky="nw")
+    detail_labels["market_cap"].grid(row=2, column=0, padx=(5, 5), sticky="nw", pady=(0, 4))
+
+    # 24-hour change with the 1-hour change underneath
+    detail_labels["day_change_title"].grid(row=0, column=0, padx=(5, 5), pady=(4, 0), sticky="w")
+    detail_labels["day_change"].grid(row=1, column=0, padx=(5, 5), sticky="nw")
+    detail_labels["hour_change"].grid(row=2, column=0, padx=(5, 5), sticky="nw", pady=(0, 4))
+
+
+def show_view(name: str) -> None:
+    """
+    Shows the view with the given name next to the sidebar and hides the others.
+
+    name (str): The name of the view ("dashboard" or "portfolio").
+    """
+    for view_name, view in views.items():
+        if view_name != name:
+            view.pack_forget()
+    views[name].pack(side="left")
+
+
+def create_portfolio_view(app: CTk, holdings_path: str) -> None:
+    """
+    Creates the portfolio view with a summary of the holdings, a form to add or 
+    change a position and a table of all positions. The view is hidden until the 
+    Account button is pressed.
+
+    app (object): The main application window where the portfolio view will be attached.
+    holdings_path (str): The file path where the holdings are saved.
+    """
+    global portfolio_table_frame, portfolio_table
+
+    # Create the portfolio view frame with the same look as the main view (not packed yet)
+    portfolio_view = CTkFrame(master=app, fg_color="#242a40",  width=680, height=650, corner_radius=0)
+    portfolio_view.pack_propagate(0)
+    views["portfolio"] = portfolio_view
+
+    # Title of the view
+    title_frame = CTkFrame(master=portfolio_view, fg_color="transparent")
+    title_frame.pack(anchor="n", fill="x",  padx=27, pady=(29, 0))
+    CTkLabel(master=title_frame, text="Portfolio", font=("Arial Black", 25), 
+        text_color="#fff"
+    ).pack(anchor="nw", side="left")
+
+    # Summary of the whole portfolio
+    for field in ("total_value", "total_pnl"):
+        portfolio_vars[field] = StringVar(value="")
+
+    summary_frame = CTkFrame(master=portfolio_view, corner_radius=10, fg_color="#2c2c91")
+    summary_frame.pack(anchor="n", fill="x", padx=27, pady=(20, 0))
+    CTkLabel(master=summary_frame, text="Total Value:", text_color="#fff", font=("Arial Bold", 15)
+    ).grid(row=0, column=0, padx=(15, 5), pady=10)
+    CTkLabel(master=summary_frame, textvariable=portfolio_vars["total_value"], text_color="pink", 
+        font=("Arial Bold", 15)
+    ).grid(row=0, column=1, padx=(0, 40), pady=10)
+    CTkLabel(master=summary_frame, text="P&L:", text_color="#fff", font=("Arial Bold", 15)
+    ).grid(row=0, column=2, padx=(0, 5), pady=10)
+    portfolio_widgets["total_pnl"] = CTkLabel(master=summary_frame, textvariable=portfolio_vars["total_pnl"], 
+        text_color="#fff", font=("Arial Bold", 15))
+    portfolio_widgets["total_pnl"].grid(row=0, column=3, pady=10)
+
+    # Form to add, change or remove (quantity 0) a position
+    form_frame = CTkFrame(master=portfolio_view, fg_color="transparent")
+    form_frame.pack(anchor="n", fill="x", padx=27, pady=(15, 0))
+    portfolio_widgets["coin"] = CTkEntry(master=form_frame, placeholder_text="Symbol or id", width=130)
+    portfolio_widgets["coin"].pack(side="left", padx=(0, 8))
+    portfolio_widgets["quantity"] = CTkEntry(master=form_frame, placeholder_text="Quantity", width=130)
+    portfolio_widgets["quantity"].pack(side="left", padx=(0, 8))
+    portfolio_widgets["cost_basis"] = CTkEntry(master=form_frame, placeholder_text="Cost basis (USD)", width=150)
+    portfolio_widgets["cost_basis"].pack(side="left", padx=(0, 8))
+    CTkButton(master=form_frame, text="Save Position", corner_radius=10, font=("Arial Bold", 15), 
+        text_color="#fff", fg_color="#2c2c91", hover_color="#d37fcc", 
+        command=partial(save_position, holdings_path)
+    ).pack(side="right", ipady=5)
+
+    # Scrollable frame holding the positions table
+    portfolio_table_frame = CTkScrollableFrame(master=portfolio_view, corner_radius=10, border_width=0, 
+        fg_color="transparent", scrollbar_fg_color="transparent", 
+        scrollbar_button_color='#2c2c91', scrollbar_button_hover_color='#5d68a8', 
+    border_color="#7a7ded")
+    portfolio_table_frame.pack(expand=True, fill="both", padx=15, pady=21)
+    portfolio_table = None
+
+    update_portfolio_ui()
+
+
+def update_portfolio_ui(changed_rows: list[int] = None) -> None:
+    """
+    Updates the portfolio summary and the positions table (largest value first). 
+    The changed rows (and the allocation column, which depends on the total) are 
+    edited in place, all rows are rewritten if the order changed, and the table 
+    is only rebuilt when positions were added or removed.
+
+    changed_rows (list[int]): The portfolio rows that changed, None to redraw all.
+    """
+    # Nothing to draw before the portfolio view is created
+    if "portfolio" not in views:
+        return
+
+    # Update the summary, P&L in green when in profit and red when at a loss
+    portfolio_vars["total_value"].set(format_price(portfolio.total_value))
+    portfolio_vars["total_pnl"].set(format_pnl(portfolio.total_pnl))
+    portfolio_widgets["total_pnl"].configure(
+        text_color="#01ff85" if portfolio.total_pnl >= 0 else "#ff7a7a"
+    )
+
+    # Rebuild if the table shows a different set of positions
+    if portfolio_table is None or portfolio_table_rows.keys() != portfolio.index.keys():
+        rebuild_portfolio_table()
+        return
+
+    # Values moved the positions around, rewrite every row in the new order 
+    # (only the cell texts change, no widgets are created)
+    order = portfolio_display_order(portfolio)
+    if any(portfolio_table_rows[portfolio.ids[row]] != table_row for table_row, row in enumerate(order, start=1)):
+        for table_row, row in enumerate(order, start=1):
+            portfolio_table_rows[portfolio.ids[row]] = table_row
+            for column, value in enumerate(format_portfolio_row(portfolio, row)):
+                portfolio_table.insert(table_row, column, value)
+        return
+
+    if changed_rows is None:
+        changed_rows = range(len(portfolio.ids))
+
+    # Edit the cells of the changed positions (allocation is done below for all)
+    for row in changed_rows:
+        table_row = portfolio_table_rows[portfolio.ids[row]]
+        for column, value in enumerate(format_portfolio_row(portfolio, row)[:5]):
+            portfolio_table.insert(table_row, column, value)
+
+    # The allocation of every priced position moves with the total value
+    for row, crypto_id in enumerate(portfolio.ids):
+        if portfolio.price[row] is not None:
+            portfolio_table.insert(portfolio_table_rows[crypto_id], 5, format_allocation(portfolio.allocation[row]))
+
+
+def rebuild_portfolio_table() -> None:
+    """
+    Destroys the positions table and creates a new one from the current 
+    portfolio columns (largest position first).
+    """
+    global portfolio_table
+
+    table_data = [["Coin", "Quantity", "Price(USD)", "Value", "P&L", "Alloc. %"]]
+    table_data = process_portfolio_data(portfolio, table_data)
+
+    # Remember which table row shows which position
+    portfolio_table_rows.clear()
+    for table_row, row in enumerate(portfolio_display_order(portfolio), start=1):
+        portfolio_table_rows[portfolio.ids[row]] = table_row
+
+    # Destroy the old table UI element
+    if portfolio_table is not None:
+        portfolio_table.destroy()
+
+    portfolio_table = CTkTable(master=portfolio_table_frame, border_width=7, border_color="#2c2c91", 
+        values=table_data, colors=["#484ab8", "#5a5de6"], header_color="#2c2c91", 
+    hover_color="#B4B4B4", corner_radius=10)
+    portfolio_table.edit_row(0, text_color="#fff", font=("Arial Bold", 15), hover_color="#2c2c91")
+    for row_index in range(1, len(table_data)):
+        portfolio_table.edit_row(row_index, text_color="#fff", font=("Arial Bold", 12), hover_color="#d37fcc")
+    portfolio_table.pack(expand=True)
+
+
+def save_position(holdings_path: str) -> None:
+    """
+    Reads the position form, updates that single position in the portfolio and 
+    saves the holdings file.
+
+    holdings_path (str): The file path where the holdings are saved.
+    """
+    coin = portfolio_widgets["coin"].get().strip()
+
+    # Accept either the coin id or its symbol (from the latest data)
+    if coin.isdigit():
+        crypto_id = int(coin)
+    else:
+        crypto_id = next((row[-1] for row in crypto_index.values() if row[6] == coin.upper()), None)
+        if crypto_id is None:
+            print(f"Unknown coin: {coin}")
+            return
+
+    quantity_text = portfolio_widgets["quantity"].get().strip()
+    cost_basis_text = portfolio_widgets["cost_basis"].get().strip()
+    existing = portfolio.position(crypto_id)
+
+    # A quantity is always required, only an explicit 0 removes the position
+    if not quantity_text:
+        print("Enter a quantity (0 removes the position).")
+        return
+
+    try:
+        quantity = float(quantity_text)
+        cost_basis = float(cost_basis_text) if cost_basis_text else None
+    except ValueError:
+        print("Quantity and cost basis must be numbers.")
+        return
+
+    if quantity < 0 or (cost_basis is not None and cost_basis < 0):
+        print("Quantity and cost basis can not be negative.")
+        return
+
+    # A blank cost basis keeps the one of an existing position
+    if cost_basis is None:
+        if existing is not None:
+            cost_basis = existing["cost_basis"]
+        elif quantity > 0:
+            print("Enter the cost basis of the new position.")
+            return
+        else:
+            cost_basis = 0.0
+
+    portfolio.set_position(crypto_id, quantity, cost_basis)
+    # Fills in the price and name of a newly added position, other rows are unchanged
+    portfolio.update_prices(latest_data)
+    save_holdings(holdings_path, portfolio.holdings())
+
+    # Redraw only the edited position (a new or removed one rebuilds the table)
+    row = portfolio.index.get(crypto_id)
+    update_portfolio_ui([row] if row is not None else [])
 
 
 def create_table_view(main_view: CTkFrame, table_data: list) -> None:
@@ -373,15 +767,104 @@ def create_table_view(main_view: CTkFrame, table_data: list) -> None:
     table.pack(expand=True)
 
 
-def main():
+def parse_args() -> argparse.Namespace:
+    """
+    Reads the command line options, all of them belong to the replay mode.
+
+    Returns:
+    argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="CStats crypto tracker")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", metavar="DIR", 
+        help="replay the saved snapshots (*.json) in DIR instead of pulling from the API")
+    source.add_argument("--synthetic", metavar="N", type=int, 
+        help="replay synthetic random-walk price updates for N coins")
+    parser.add_argument("--interval", metavar="MS", type=int, default=100, 
+        help="time between two replayed pulls in milliseconds (default: 100)")
+    parser.add_argument("--pulls", type=int, default=1000, 
+        help="number of pulls to replay (default: 1000)")
+    parser.add_argument("--tracemalloc", action="store_true", 
+        help="also report Python allocations (slows the replayed frames down)")
+    args = parser.parse_args()
+
+    # The replay needs an existing snapshot directory with at least one snapshot
+    if args.replay is not None:
+        if not os.path.isdir(args.replay):
+            parser.error(f"--replay directory not found: {args.replay}")
+        if not load_snapshot_paths(args.replay):
+            parser.error(f"--replay directory has no .json snapshots: {args.replay}")
+
+    # The replay needs a positive interval and number of pulls (and coins)
+    if args.synthetic is not None and args.synthetic <= 0:
+        parser.error("--synthetic must be greater than 0")
+    if args.interval <= 0:
+        parser.error("--interval must be greater than 0")
+    if args.pulls <= 0:
+        parser.error("--pulls must be greater than 0")
+
+    return args
+
+
+def start_replay(app: CTk, args: argparse.Namespace, data_file_path: str) -> None:
+    """
+    Starts feeding replayed pulls through update_data on the tkinter loop.
+
+    app (object): The main application window.
+    args (argparse.Namespace): The replay options.
+    data_file_path (str): The saved pull used as the base of synthetic coins.
+    """
+    global replay_runner
+
+    if args.replay is not None:
+        snapshot_paths = load_snapshot_paths(args.replay)
+        if not snapshot_paths:
+            print(f"No snapshots found in {args.replay}")
+            return
+        runner = ReplayRunner(app, update_data, args.interval, args.pulls, snapshot_paths=snapshot_paths, 
+                              trace_python=args.tracemalloc)
+    else:
+        base_data = []
+        if os.path.exists(data_file_path):
+            with open(data_file_path, "r") as file:
+                base_data = json.load(file).get("data", [])
+        coins = make_synthetic_coins(args.synthetic, base_data)
+        runner = ReplayRunner(app, update_data, args.interval, args.pulls, coins=coins, 
+                              trace_python=args.tracemalloc)
+
+    replay_runner = runner
+    runner.start()
+
+
+def close_app(app: CTk) -> None:
+    """
+    Prints the report of a running replay, saves the metadata cache index (so 
+    the logo use times survive a restart) and closes the app window.
+
+    app (object): The main application window.
+    """
+    if replay_runner is not None:
+        replay_runner.finish()
+    if metadata_cache is not None:
+        metadata_cache.save()
+    app.destroy()
+
+
+def main(args: argparse.Namespace = None):
     """
     Main function to initialize and run the crypto dashboard application.
     It sets up the app window, creates the sidebar, main view, metrics view,
-    and table view, then pulls and updates crypto data.
+    and table view, then pulls and updates crypto data (or starts the replay 
+    mode if it was asked for on the command line).
+
+    args (argparse.Namespace): The command line options.
     """
 
+    global portfolio, metadata_cache
+
     # File paths and initial variables
     data_file_path = 'crypto_data.json'
+    holdings_path = 'portfolio.json'
     active_message = [0, '']
     table_data = [["Rank", "Crypto", "Price(USD)"]]
 
@@ -389,22 +872,32 @@ def main():
     app = CTk()
     app.geometry("856x645")
     app.resizable(0, 0)
+    app.protocol("WM_DELETE_WINDOW", partial(close_app, app))
 
     # Set initial appearance mode (light mode)
     set_appearance_mode("light")
     
+    # Load the user's holdings and the cached coin metadata
+    portfolio = Portfolio(load_holdings(holdings_path))
+    metadata_cache = MetadataCache()
+
     # Create the UI components
     create_sidebar(app)
     main_view = create_main_view(app)
     create_metrics_view(main_view)
     create_table_view(main_view, table_data)
+    create_portfolio_view(app, holdings_path)
 
-    # Initial data pull and update
-    check_last_pulled_and_pull(data_file_path, active_message)
-    update_data(data_file_path) #MIGHT NOT NEED???
+    # Replay mode drives the UI from saved or synthetic pulls, without the API
+    if args is not None and (args.replay is not None or args.synthetic is not None):
+        start_replay(app, args, data_file_path)
+    else:
+        # Initial data pull and update
+        check_last_pulled_and_pull(data_file_path, active_message)
+        update_data(data_file_path) #MIGHT NOT NEED???
 
     # Start the app loop for tkinter window
     app.mainloop()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(parse_args())
\ No newline at end of file
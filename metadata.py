@@ -0,0 +1,327 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════════╗
+║                          CStats Metadata Enrichment File                         ║
+║                                                                                  ║
+║ This file adds coin logos and descriptions to the listing data. They come from   ║
+║ CoinMarketCap's metadata endpoint, keyed by the coin ids of the listing, and are ║
+║ kept in an on-disk cache so they are only requested once per coin.               ║
+║                                                                                  ║
+║ Key features:                                                                    ║
+║ - Batches ids into multi-id metadata requests that run in parallel.              ║
+║ - Only requests ids that are not in the cache yet, so a refresh with the same    ║
+║   coins costs no extra requests.                                                 ║
+║ - Saves logos with a pre-resized thumbnail for the table, so the table never has ║
+║   to resize (or re-decode) a full size logo.                                     ║
+║ - Keeps the logo cache below a size limit by removing the least recently used    ║
+║   logos first. Logos of the coins in the current listing are never removed (the  ║
+║   cache may go over the limit if they alone do not fit), so a refresh never      ║
+║   downloads a logo it removed itself. A removed logo is only downloaded again    ║
+║   once its coin is back in the listing.                                          ║
+║ - Ids the endpoint does not return and logos that fail to download are marked    ║
+║   and only tried again after RETRY_BACKOFF.                                      ║
+║                                                                                  ║
+║ Cache layout (metadata_cache/):                                                  ║
+║     index.json         id -> name, symbol, description, logo url, last used      ║
+║     logos/<id>.png     the logo as downloaded                                    ║
+║     thumbs/<id>.png    the logo resized to THUMBNAIL_SIZE                        ║
+╚══════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+
+import os
+import json
+import time
+import threading
+from io import BytesIO
+from functools import partial
+from PIL import Image
+from requests import Session
+from concurrent.futures import ThreadPoolExecutor
+
+
+METADATA_URL = 'https://pro-api.coinmarketcap.com/v2/cryptocurrency/info'  # Metadata endpoint
+CACHE_DIR = 'metadata_cache'            # Directory of the on-disk cache
+BATCH_SIZE = 100                        # Number of ids per metadata request
+MAX_WORKERS = 4                         # Number of requests running at the same time
+THUMBNAIL_SIZE = (20, 20)               # Size of the logos shown in the table
+MAX_CACHE_BYTES = 20 * 1024 * 1024      # Size limit of the logos and thumbnails on disk
+RETRY_BACKOFF = 6 * 60 * 60             # Seconds before a missing id or failed logo is tried again
+
+
+class MetadataCache:
+    """
+    On-disk cache of coin metadata and logos. The index is kept in memory and
+    written back with `save`, logo files are bounded by `max_bytes` (least
+    recently used first out).
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        """
+        cache_dir (str): Directory of the cache.
+        max_bytes (int): Size limit of the logo and thumbnail files.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.logo_dir = os.path.join(cache_dir, "logos")
+        self.thumb_dir = os.path.join(cache_dir, "thumbs")
+        self.lock = threading.Lock()    # Logos are stored from several threads
+        self.listed_ids = set()         # Ids of the current listing, their logos are never evicted
+
+        os.makedirs(self.logo_dir, exist_ok=True)
+        os.makedirs(self.thumb_dir, exist_ok=True)
+
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r") as file:
+                    # JSON keys are strings, the coin ids are ints
+                    self.index = {int(crypto_id): info for crypto_id, info in json.load(file).items()}
+            except Exception as e:
+                print(f"Error reading metadata cache: {e}")
+
+        # Size of the logo files on disk, kept up to date as logos are added/removed
+        self.total_bytes = sum(info.get("logo_bytes", 0) for info in self.index.values())
+
+    def save(self) -> None:
+        """
+        Writes the index to disk.
+        """
+        try:
+            with self.lock:
+                with open(self.index_path, "w") as file:
+                    json.dump(self.index, file)
+        except Exception as e:
+            print(f"Error saving metadata cache: {e}")
+
+    def set_listed(self, ids: list[int]) -> None:
+        """
+        Sets the ids of the current listing, whose logos are kept on disk even if 
+        the cache is over its size limit.
+        """
+        with self.lock:
+            self.listed_ids = set(ids)
+
+    def missing_ids(self, ids: list[int]) -> list[int]:
+        """
+        Returns the ids that have never been fetched, plus the ids that were not 
+        returned last time once their retry time has passed.
+        """
+        now = time.time()
+        return [
+            crypto_id for crypto_id in ids
+            if crypto_id not in self.index or 0 < self.index[crypto_id].get("retry_after", 0) <= now
+        ]
+
+    def missing_logos(self, ids: list[int]) -> list[int]:
+        """
+        Returns the known ids whose logo is not on disk (never downloaded or evicted), 
+        skipping logos that failed until their retry time has passed.
+        """
+        now = time.time()
+        return [
+            crypto_id for crypto_id in ids
+            if crypto_id in self.index and self.index[crypto_id].get("logo_url")
+            and not self.index[crypto_id].get("logo_bytes")
+            and self.index[crypto_id].get("logo_retry_after", 0) <= now
+        ]
+
+    def mark_missing(self, crypto_id: int) -> None:
+        """
+        Marks an id that was requested but not returned (unknown, inactive or the 
+        request failed), so it is not requested again before RETRY_BACKOFF.
+        """
+        with self.lock:
+            self.index[crypto_id] = {
+                "name": "",
+                "symbol": "",
+                "description": "",
+                "logo_url": "",
+                "logo_bytes": 0,
+                "last_used": time.time(),
+                "retry_after": time.time() + RETRY_BACKOFF
+            }
+
+    def mark_logo_failed(self, crypto_id: int) -> None:
+        """
+        Marks a logo that could not be downloaded or decoded, so it is not 
+        downloaded again before RETRY_BACKOFF.
+        """
+        with self.lock:
+            self.index[crypto_id]["logo_retry_after"] = time.time() + RETRY_BACKOFF
+
+    def add_info(self, crypto_id: int, info: dict) -> None:
+        """
+        Adds the metadata of a coin from the metadata endpoint's response.
+        """
+        with self.lock:
+            self.index[crypto_id] = {
+                "name": info.get("name", ""),
+                "symbol": info.get("symbol", ""),
+                "description": info.get("description") or "",
+                "logo_url": info.get("logo") or "",
+                "logo_bytes": 0,
+                "last_used": time.time()
+            }
+
+    def store_logo(self, crypto_id: int, raw: bytes) -> None:
+        """
+        Saves a downloaded logo with its thumbnail and removes the least recently
+        used logos if the cache is over its size limit.
+        """
+        # Decode and resize once here, the table only ever loads the thumbnail
+        thumbnail = Image.open(BytesIO(raw)).convert("RGBA").resize(THUMBNAIL_SIZE, Image.LANCZOS)
+        thumb_buffer = BytesIO()
+        thumbnail.save(thumb_buffer, format="PNG")
+        thumb_raw = thumb_buffer.getvalue()
+
+        with open(os.path.join(self.logo_dir, f"{crypto_id}.png"), "wb") as file:
+            file.write(raw)
+        with open(os.path.join(self.thumb_dir, f"{crypto_id}.png"), "wb") as file:
+            file.write(thumb_raw)
+
+        with self.lock:
+            info = self.index[crypto_id]
+            self.total_bytes += len(raw) + len(thumb_raw) - info["logo_bytes"]
+            info["logo_bytes"] = len(raw) + len(thumb_raw)
+            info["last_used"] = time.time()
+            info.pop("logo_retry_after", None)
+            self._evict(keep=crypto_id)
+
+    def thumbnail_path(self, crypto_id: int) -> str:
+        """
+        Returns the thumbnail file of a coin and marks it as used, or None if
+        the logo is not in the cache.
+        """
+        with self.lock:
+            info = self.index.get(crypto_id)
+            if info is None or not info.get("logo_bytes"):
+                return None
+
+            # Saved with the index (on the next enrichment or when the app closes)
+            info["last_used"] = time.time()
+        return os.path.join(self.thumb_dir, f"{crypto_id}.png")
+
+    def description(self, crypto_id: int) -> str:
+        """
+        Returns the description of a coin, or an empty string if it is unknown.
+        """
+        info = self.index.get(crypto_id)
+        return info["description"] if info else ""
+
+    def _evict(self, keep: int) -> None:
+        """
+        Removes the least recently used logos until the cache fits its size limit
+        (must be called with the lock held). Logos of the current listing are kept, 
+        the metadata stays in the index so only the logo has to be downloaded again 
+        if its coin comes back into the listing.
+        """
+        if self.total_bytes <= self.max_bytes:
+            return
+
+        stored = sorted(
+            (info["last_used"], crypto_id) for crypto_id, info in self.index.items()
+            if info.get("logo_bytes") and crypto_id != keep and crypto_id not in self.listed_ids
+        )
+        for _, crypto_id in stored:
+            if self.total_bytes <= self.max_bytes:
+                break
+            for directory in (self.logo_dir, self.thumb_dir):
+                path = os.path.join(directory, f"{crypto_id}.png")
+                if os.path.exists(path):
+                    os.remove(path)
+            self.total_bytes -= self.index[crypto_id]["logo_bytes"]
+            self.index[crypto_id]["logo_bytes"] = 0
+
+
+def fetch_metadata_batch(session: Session, ids: list[int]) -> dict:
+    """
+    Requests the metadata of several coins in one call.
+
+    session (Session): The session with the API key headers.
+    ids (list[int]): The coin ids to request (at most BATCH_SIZE).
+
+    Returns:
+    dict: The metadata keyed by coin id, empty if the request failed (the 
+    caller marks every id that is not in it).
+    """
+    try:
+        response = session.get(METADATA_URL, params={'id': ",".join(str(crypto_id) for crypto_id in ids)})
+        if response.status_code != 200:
+            print(f"Metadata request failed: {response.status_code}")
+            return {}
+        return {int(crypto_id): info for crypto_id, info in response.json().get("data", {}).items()}
+    except Exception as e:
+        print(f"Metadata request failed: {str(e)}")
+        return {}
+
+
+def fetch_logo(session: Session, cache: MetadataCache, crypto_id: int) -> None:
+    """
+    Downloads the logo of a coin and stores it (with its thumbnail) in the cache.
+
+    session (Session): A session without the API headers, the logos are on a 
+    different host that must not receive the API key.
+    """
+    try:
+        response = session.get(cache.index[crypto_id]["logo_url"])
+        if response.status_code == 200:
+            cache.store_logo(crypto_id, response.content)
+            return
+        print(f"Logo download failed for {crypto_id}: {response.status_code}")
+    except Exception as e:
+        # Network errors as well as logos Pillow can not decode (e.g. SVG)
+        print(f"Logo download failed for {crypto_id}: {str(e)}")
+
+    cache.mark_logo_failed(crypto_id)
+
+
+def enrich(ids: list[int], cache: MetadataCache, headers: dict, listed_ids: list[int] = None) -> int:
+    """
+    Fetches the metadata and logos of the ids that are not in the cache yet.
+    Metadata requests are batched and, like the logo downloads, run in parallel.
+
+    ids (list[int]): The coin ids of a listing.
+    cache (MetadataCache): The metadata cache to fill.
+    headers (dict): The API headers (with the API key).
+    listed_ids (list[int]): All ids of the current listing, whose logos are kept 
+    on disk. Defaults to `ids`.
+
+    Returns:
+    int: The number of coins whose metadata was fetched.
+    """
+    # The logos of this listing must stay on disk, or the next refresh would fetch them again
+    cache.set_listed(ids if listed_ids is None else listed_ids)
+
+    new_ids = cache.missing_ids(ids)
+    missing_logos = cache.missing_logos(ids)
+
+    # Steady state: every coin is known and its logo is on disk
+    if not new_ids and not missing_logos:
+        return 0
+
+    # Only the metadata endpoint gets the API key, logos are fetched without it
+    session = Session()
+    session.headers.update(headers)
+    logo_session = Session()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # One request per batch of ids, all batches at the same time
+        batches = [new_ids[i:i + BATCH_SIZE] for i in range(0, len(new_ids), BATCH_SIZE)]
+        fetched = 0
+        for batch, metadata in zip(batches, executor.map(partial(fetch_metadata_batch, session), batches)):
+            for crypto_id in batch:
+                if crypto_id in metadata:
+                    cache.add_info(crypto_id, metadata[crypto_id])
+                    fetched += 1
+                else:
+                    # Not returned (or the request failed), wait before asking again
+                    cache.mark_missing(crypto_id)
+
+        # Logos of the new coins plus the ones that were evicted
+        logo_ids = cache.missing_logos(ids)
+        list(executor.map(partial(fetch_logo, logo_session, cache), logo_ids))
+
+    cache.save()
+    return fetched
+
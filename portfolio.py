@@ -0,0 +1,244 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════════╗
+║                              CStats Portfolio File                               ║
+║                                                                                  ║
+║ This file keeps track of the user's own cryptocurrency holdings. Holdings are    ║
+║ loaded from a local JSON file and joined to every data pull by coin id to work   ║
+║ out the value, profit/loss and allocation of each position.                      ║
+║                                                                                  ║
+║ Key features:                                                                    ║
+║ - Loads and saves holdings (coin id, quantity, cost basis) from a JSON file.     ║
+║ - Stores the positions column by column with an id -> row index for joins.       ║
+║ - Computes value, P&L and allocation one whole column at a time.                 ║
+║ - Updates incrementally: only positions whose price or quantity changed are      ║
+║   recomputed, and the portfolio totals are adjusted by the difference.           ║
+║ - Positions without a price yet (coin not in any pull so far) have a price and   ║
+║   P&L of None and are left out of the totals until they are priced.             ║
+║                                                                                  ║
+║ Holdings file format (portfolio.json):                                           ║
+║     {"holdings": [{"id": 1, "quantity": 0.5, "cost_basis": 20000}]}              ║
+║ where cost_basis is the total amount paid (in USD) for the position.             ║
+╚══════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+
+import os
+import json
+
+
+def load_holdings(file_path: str) -> list[dict]:
+    """
+    Loads the holdings from the JSON file.
+
+    file_path (str): Path to the holdings JSON file.
+
+    Returns:
+    list[dict]: The holdings, each with an id, quantity and cost_basis. An empty
+    list is returned if the file does not exist or can not be read.
+    """
+    if not os.path.exists(file_path):
+        return []
+
+    try:
+        with open(file_path, "r") as file:
+            data = json.load(file)
+        return [
+            {
+                "id": int(holding["id"]),
+                "quantity": float(holding["quantity"]),
+                "cost_basis": float(holding.get("cost_basis", 0))
+            }
+            for holding in data.get("holdings", [])
+        ]
+    except Exception as e:
+        print(f"Error reading holdings: {e}")
+        return []
+
+
+def save_holdings(file_path: str, holdings: list[dict]) -> None:
+    """
+    Saves the holdings to the JSON file.
+
+    file_path (str): Path to the holdings JSON file.
+    holdings (list[dict]): The holdings, each with an id, quantity and cost_basis.
+    """
+    try:
+        with open(file_path, "w") as file:
+            json.dump({"holdings": holdings}, file, indent=4)
+    except Exception as e:
+        print(f"Error saving holdings: {e}")
+
+
+class Portfolio:
+    """
+    The user's positions stored as columns (one list per field) with an index
+    from coin id to row, so a data pull is joined by id and every derived column
+    (value, P&L, allocation) is computed in one pass over its inputs.
+    """
+
+    def __init__(self, holdings: list[dict]):
+        """
+        holdings (list[dict]): The holdings, each with an id, quantity and cost_basis.
+        """
+        self.index = {}             # Maps a coin id to its row in the columns
+        self.ids = []
+        self.names = []
+        self.symbols = []
+        self.quantity = []
+        self.cost_basis = []
+        self.price = []
+        self.value = []
+        self.pnl = []
+        self.allocation = []
+
+        self.total_value = 0.0
+        self.total_cost = 0.0      # Cost basis of the priced positions only
+
+        for holding in holdings:
+            self.set_position(holding["id"], holding["quantity"], holding["cost_basis"])
+
+    @property
+    def total_pnl(self) -> float:
+        """
+        The profit/loss of the whole portfolio (priced positions only).
+        """
+        return self.total_value - self.total_cost
+
+    def holdings(self) -> list[dict]:
+        """
+        Returns the positions in the same format as the holdings file.
+        """
+        return [
+            {"id": crypto_id, "quantity": quantity, "cost_basis": cost_basis}
+            for crypto_id, quantity, cost_basis in zip(self.ids, self.quantity, self.cost_basis)
+        ]
+
+    def position(self, crypto_id: int) -> dict:
+        """
+        Returns a single position in the holdings file format, or None if the 
+        coin is not held.
+        """
+        row = self.index.get(crypto_id)
+        if row is None:
+            return None
+        return {"id": crypto_id, "quantity": self.quantity[row], "cost_basis": self.cost_basis[row]}
+
+    def update_prices(self, data: list) -> list[int]:
+        """
+        Joins a data pull to the positions by coin id and updates the positions
+        whose price changed.
+
+        data (list): The list of cryptocurrency data entries from the API.
+
+        Returns:
+        list[int]: The rows whose price changed (empty if none did).
+        """
+        changed_rows = []
+
+        for crypto in data:
+            row = self.index.get(crypto["id"])
+            if row is None:
+                continue
+
+            # Names only need filling in the first time a coin is seen
+            if not self.names[row]:
+                self.names[row] = crypto["name"]
+                self.symbols[row] = crypto["symbol"]
+
+            price = crypto["quote"]["USD"]["price"]
+            if price != self.price[row]:
+                # The cost basis counts towards the totals once the position is priced
+                if self.price[row] is None:
+                    self.total_cost += self.cost_basis[row]
+                self.price[row] = price
+                changed_rows.append(row)
+
+        return self._revalue(changed_rows)
+
+    def set_position(self, crypto_id: int, quantity: float, cost_basis: float) -> None:
+        """
+        Adds a position or changes an existing one, a quantity of 0 removes it.
+
+        crypto_id (int): The coin id of the position.
+        quantity (float): The amount of coins held.
+        cost_basis (float): The total amount paid for the position.
+        """
+        row = self.index.get(crypto_id)
+
+        if quantity <= 0:
+            if row is not None:
+                self._remove_row(row)
+            return
+
+        if row is None:
+            # Append a new row to every column
+            row = len(self.ids)
+            self.index[crypto_id] = row
+            self.ids.append(crypto_id)
+            self.names.append("")
+            self.symbols.append("")
+            self.quantity.append(quantity)
+            self.cost_basis.append(cost_basis)
+            self.price.append(None)     # Not priced until it is found in a pull
+            self.value.append(0.0)
+            self.pnl.append(None)
+            self.allocation.append(0.0)
+        else:
+            if self.price[row] is not None:
+                self.total_cost += cost_basis - self.cost_basis[row]
+            self.quantity[row] = quantity
+            self.cost_basis[row] = cost_basis
+
+        self._revalue([row])
+
+    def _remove_row(self, row: int) -> None:
+        """
+        Removes a position by swapping the last row into its place.
+        """
+        self.total_value -= self.value[row]
+        if self.price[row] is not None:
+            self.total_cost -= self.cost_basis[row]
+        del self.index[self.ids[row]]
+
+        last = len(self.ids) - 1
+        columns = (self.ids, self.names, self.symbols, self.quantity, self.cost_basis,
+                   self.price, self.value, self.pnl, self.allocation)
+        for column in columns:
+            column[row] = column[last]
+            column.pop()
+
+        # Point the index at the moved row
+        if row != last:
+            self.index[self.ids[row]] = row
+
+        self._update_allocation()
+
+    def _revalue(self, rows: list[int]) -> list[int]:
+        """
+        Recomputes value and P&L of the given rows, adjusts the total by the
+        difference and refreshes the allocation column.
+
+        Returns:
+        list[int]: The rows that were recomputed.
+        """
+        if not rows:
+            return rows
+
+        for row in rows:
+            # Unpriced positions keep a value of 0 and no P&L
+            if self.price[row] is None:
+                continue
+            new_value = self.quantity[row] * self.price[row]
+            self.total_value += new_value - self.value[row]
+            self.value[row] = new_value
+            self.pnl[row] = new_value - self.cost_basis[row]
+
+        self._update_allocation()
+        return rows
+
+    def _update_allocation(self) -> None:
+        """
+        Recomputes the allocation column (percent of total value) in one pass.
+        """
+        total = self.total_value
+        self.allocation = [value / total * 100 if total > 0 else 0.0 for value in self.value]
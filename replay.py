@@ -0,0 +1,367 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════════╗
+║                              CStats Replay Mode File                             ║
+║                                                                                  ║
+║ This file drives the real UI update path (update_data -> process_crypto_data ->  ║
+║ update_table_ui) with a stream of data pulls without touching the API, to load   ║
+║ test the app and tune the refresh behaviour.                                     ║
+║                                                                                  ║
+║ Key features:                                                                    ║
+║ - Replays a directory of saved API responses (*.json, in file name order).       ║
+║ - Or generates synthetic random-walk price updates for N coins.                  ║
+║ - Feeds one pull every `interval_ms` milliseconds through the tkinter loop.      ║
+║ - Reports frame times, dropped updates and memory growth at the end of the run.  ║
+║   Memory is the resident set size (RSS) of the whole process, so Tk widgets are  ║
+║   counted too. Python allocations can be traced as well (--tracemalloc), which   ║
+║   slows the frames down, so it is off by default.                                ║
+║                                                                                  ║
+║ The report is also printed (for the pulls so far) if the window is closed or an  ║
+║ update fails during the run.                                                     ║
+║                                                                                  ║
+║ A pull is counted as dropped when the previous frame took so long that its       ║
+║ scheduled time had already passed, the replay then skips ahead to stay on time.  ║
+║                                                                                  ║
+║ Example usage:                                                                   ║
+║     python main.py --replay snapshots/ --interval 100                            ║
+║     python main.py --synthetic 500 --interval 100 --pulls 3000                   ║
+║     python main.py --synthetic 50 --pulls 500 --tracemalloc                      ║
+╚══════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+
+import os
+import sys
+import json
+import math
+import random
+import tracemalloc
+from time import perf_counter
+from datetime import datetime
+
+
+def load_snapshot_paths(directory: str) -> list[str]:
+    """
+    Lists the saved snapshots (API responses saved as JSON files) in a directory.
+
+    directory (str): The directory holding the snapshot files.
+
+    Returns:
+    list[str]: The snapshot file paths sorted by file name.
+    """
+    return [
+        os.path.join(directory, file_name)
+        for file_name in sorted(os.listdir(directory))
+        if file_name.endswith(".json")
+    ]
+
+
+def make_synthetic_coins(num_coins: int, base_data: list) -> list:
+    """
+    Creates the starting coins for a synthetic replay, based on the coins of a
+    saved pull (repeated with new ids if more coins are asked for) or made up
+    if there is no saved pull.
+
+    num_coins (int): The number of coins to generate.
+    base_data (list): Coin entries of a saved pull, may be empty.
+
+    Returns:
+    list: The coin entries in the same format as the API response.
+    """
+    coins = []
+
+    for number in range(num_coins):
+        if base_data:
+            coin = json.loads(json.dumps(base_data[number % len(base_data)]))
+            if number >= len(base_data):
+                # Give repeated coins their own id and name
+                coin["id"] = 1_000_000 + number
+                coin["name"] = f"{coin['name']} #{number // len(base_data)}"
+        else:
+            price = 10 ** random.uniform(-3, 4)
+            supply = 10 ** random.uniform(6, 10)
+            coin = {
+                "id": 1_000_000 + number,
+                "name": f"Coin {number + 1}",
+                "symbol": f"C{number + 1}",
+                "total_supply": supply,
+                "circulating_supply": supply,
+                "quote": {"USD": {
+                    "price": price,
+                    "percent_change_1h": 0.0,
+                    "percent_change_24h": 0.0,
+                    "market_cap": price * supply
+                }}
+            }
+        coins.append(coin)
+
+    return coins
+
+
+def random_walk_step(coins: list, volatility: float) -> None:
+    """
+    Moves the price of every coin one random-walk step and updates the percent
+    changes and market cap to match.
+
+    coins (list): The coin entries to update in place.
+    volatility (float): Standard deviation of the relative price change per step.
+    """
+    for coin in coins:
+        quote = coin["quote"]["USD"]
+        step = math.exp(random.gauss(0, volatility))
+        quote["price"] *= step
+
+        # Let the changes drift with the price so the arrows flip now and then
+        quote["percent_change_1h"] = quote["percent_change_1h"] * 0.9 + (step - 1) * 100
+        quote["percent_change_24h"] = quote["percent_change_24h"] * 0.99 + (step - 1) * 100
+        quote["market_cap"] = quote["price"] * (coin.get("circulating_supply") or coin["total_supply"])
+
+
+def process_rss() -> int:
+    """
+    Returns the resident set size (RSS) of the process in bytes, or None if it 
+    can not be read on this platform.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            # Second field of statm is the resident size in pages
+            with open("/proc/self/statm", "r") as file:
+                return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                    (name, ctypes.c_size_t) for name in (
+                        "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", 
+                        "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", 
+                        "PagefileUsage", "PeakPagefileUsage")
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+            )
+            return counters.WorkingSetSize
+
+        # Other platforms (macOS): only the peak RSS is available, in bytes
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception as e:
+        print(f"Error reading process memory: {e}")
+        return None
+
+
+class ReplayRunner:
+    """
+    Feeds data pulls through the app's update function on the tkinter loop and
+    records how long each frame took.
+    """
+
+    def __init__(self, app, update, interval_ms: int, pulls: int, snapshot_paths: list[str] = None,
+                 coins: list = None, replay_file: str = "replay_data.json", volatility: float = 0.002,
+                 trace_python: bool = False):
+        """
+        app (CTk): The main app window, used to schedule the pulls.
+        update (function): The app's update function, called with a data file path.
+        interval_ms (int): Time between two pulls in milliseconds.
+        pulls (int): Number of pulls to replay, snapshots are looped if there are fewer.
+        snapshot_paths (list[str]): Saved snapshots to replay (directory mode).
+        coins (list): Starting coins of a synthetic replay (synthetic mode).
+        replay_file (str): File the synthetic pulls are written to before each update.
+        volatility (float): Random-walk volatility of the synthetic prices.
+        trace_python (bool): Also trace Python allocations with tracemalloc (slows 
+        the frames down, so the frame times are less accurate).
+        """
+        if interval_ms <= 0 or pulls <= 0:
+            raise ValueError("interval_ms and pulls must be greater than 0")
+
+        self.app = app
+        self.update = update
+        self.interval = interval_ms / 1000
+        self.pulls = pulls
+        self.snapshot_paths = snapshot_paths or []
+        self.coins = coins
+        self.replay_file = replay_file
+        self.volatility = volatility
+        self.trace_python = trace_python
+
+        self.pull_number = 0
+        self.dropped = 0
+        self.frame_times = []
+        self.memory_samples = []        # Process RSS after every frame
+        self.python_samples = []        # Traced Python memory after every frame (if traced)
+        self.start_time = 0.0
+        self.after_id = None            # The scheduled next pull
+        self.report = None              # Set once the replay has finished
+
+    def start(self) -> None:
+        """
+        Starts the replay, the first pull runs as soon as the tkinter loop is idle.
+        """
+        if self.trace_python:
+            tracemalloc.start()
+        self.start_time = perf_counter()
+        self.after_id = self.app.after(0, self._tick)
+
+    def _next_snapshot(self) -> str:
+        """
+        Returns the data file for the current pull, writing a synthetic pull if
+        there are no saved snapshots.
+        """
+        if self.snapshot_paths:
+            return self.snapshot_paths[self.pull_number % len(self.snapshot_paths)]
+
+        random_walk_step(self.coins, self.volatility)
+        with open(self.replay_file, "w") as file:
+            json.dump({"data": self.coins, "LastTimePulled": datetime.now().isoformat()}, file)
+        return self.replay_file
+
+    def _tick(self) -> None:
+        """
+        Runs one pull through the update path and schedules the next one. If the 
+        update fails, the replay stops and the report of the pulls so far is printed.
+        """
+        self.after_id = None
+        try:
+            self._run_pull()
+        except Exception as e:
+            print(f"Replay stopped, pull {self.pull_number + 1} failed: {e}")
+            self.finish()
+            return
+
+        if self.pull_number >= self.pulls:
+            self.finish()
+            return
+
+        next_due = self.start_time + self.pull_number * self.interval
+        delay_ms = max(0, int((next_due - perf_counter()) * 1000))
+        self.after_id = self.app.after(delay_ms, self._tick)
+
+    def _run_pull(self) -> None:
+        """
+        Skips the pulls that are already late, then times one pull through the 
+        update path and samples the memory.
+        """
+        # Skip the pulls whose time already passed while the last frame was running
+        now = perf_counter()
+        due = self.start_time + self.pull_number * self.interval
+        late_pulls = int((now - due) // self.interval) if now > due else 0
+        late_pulls = min(late_pulls, self.pulls - self.pull_number - 1)
+        if late_pulls > 0:
+            self.dropped += late_pulls
+            self.pull_number += late_pulls
+
+        # Time the update and the redraw it causes
+        file_path = self._next_snapshot()
+        frame_start = perf_counter()
+        self.update(file_path)
+        self.app.update_idletasks()
+        self.frame_times.append(perf_counter() - frame_start)
+
+        # Sample memory after the frame was timed
+        rss = process_rss()
+        if rss is not None:
+            self.memory_samples.append(rss)
+        if self.trace_python:
+            self.python_samples.append(tracemalloc.get_traced_memory()[0])
+        self.pull_number += 1
+
+    def finish(self) -> dict:
+        """
+        Stops the replay (also when it is cut short), stops the memory tracing and 
+        prints the replay report. Calling it again returns the same report.
+
+        Returns:
+        dict: The report values.
+        """
+        if self.report is not None:
+            return self.report
+
+        # Cancel the next pull if the replay is stopped early
+        if self.after_id is not None:
+            self.app.after_cancel(self.after_id)
+            self.after_id = None
+
+        python_peak = 0
+        if self.trace_python:
+            _, python_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        if not self.snapshot_paths and os.path.exists(self.replay_file):
+            os.remove(self.replay_file)
+
+        report = replay_report(self.frame_times, self.dropped, self.memory_samples, 
+                               perf_counter() - self.start_time, self.python_samples, python_peak)
+        print_replay_report(report)
+        self.report = report
+        return report
+
+
+def replay_report(frame_times: list[float], dropped: int, memory_samples: list[int], duration: float,
+                  python_samples: list[int] = None, python_peak: int = 0) -> dict:
+    """
+    Summarizes the frame times, dropped pulls and memory use of a replay.
+
+    frame_times (list[float]): Time of every frame in seconds.
+    dropped (int): Number of pulls skipped because a frame ran late.
+    memory_samples (list[int]): Process RSS in bytes after every frame.
+    duration (float): Total run time in seconds.
+    python_samples (list[int]): Traced Python memory in bytes after every frame (optional).
+    python_peak (int): Peak traced Python memory in bytes.
+
+    Returns:
+    dict: The report values (times in milliseconds, memory in KiB).
+    """
+    if not frame_times:
+        return {"frames": 0, "dropped": dropped}
+
+    ordered = sorted(frame_times)
+    frames = len(ordered)
+
+    report = {
+        "frames": frames,
+        "dropped": dropped,
+        "duration_s": duration,
+        "frame_mean_ms": sum(ordered) / frames * 1000,
+        "frame_p50_ms": ordered[frames // 2] * 1000,
+        "frame_p95_ms": ordered[min(int(frames * 0.95), frames - 1)] * 1000,
+        "frame_max_ms": ordered[-1] * 1000
+    }
+
+    if memory_samples:
+        report.update(memory_summary("rss", memory_samples))
+        report["rss_peak_kib"] = max(memory_samples) / 1024
+
+    if python_samples:
+        report.update(memory_summary("python", python_samples))
+        report["python_peak_kib"] = python_peak / 1024
+
+    return report
+
+
+def memory_summary(name: str, samples: list[int]) -> dict:
+    """
+    Returns the start, end and growth (in KiB) of a list of memory samples. The 
+    growth is measured from the end of the first tenth of the run (warm up).
+    """
+    warm = samples[min(len(samples) // 10, len(samples) - 1)]
+    return {
+        f"{name}_start_kib": samples[0] / 1024,
+        f"{name}_end_kib": samples[-1] / 1024,
+        f"{name}_growth_kib": (samples[-1] - warm) / 1024
+    }
+
+
+def print_replay_report(report: dict) -> None:
+    """
+    Prints the replay report to the terminal.
+    """
+    print("Replay report")
+    for key, value in report.items():
+        if isinstance(value, float):
+            print(f"  {key:<20}{value:>12.2f}")
+        else:
+            print(f"  {key:<20}{value:>12}")